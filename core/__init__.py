@@ -1,4 +1,4 @@
-from .llm_manager import LLMManager
+from .llmmanager import LLMManager
 from .llm import LLM
 from .config import Config
-from .message import Message
\ No newline at end of file
+from .message import Message
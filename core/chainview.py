@@ -0,0 +1,43 @@
+from collections.abc import Sequence
+from itertools import chain
+from typing import Iterator, List, Union
+from .message import Message
+
+
+class ChainView(Sequence):
+    """
+    READ-ONLY VIEW OVER SEVERAL MESSAGE SEQUENCES, PRESENTED AS ONE.
+
+    A collections.abc.Sequence: SUPPORTS ITERATION, len(), INDEXING AND SLICING (A SLICE
+    RETURNS A NEW list).
+
+    LETS THE MANAGER SEND "CONTEXT + NEW PROMPT" TO A MODEL WITHOUT COPYING THE CONTEXT.
+    THE UNDERLYING SEQUENCES ARE SHARED, SO THEY MUST NOT BE MUTATED WHILE THE VIEW IS IN USE.
+    """
+    __slots__ = ("_parts",)
+
+    def __init__(self, *parts: Sequence[Message]):
+        """
+        INITIALIZE THE VIEW.
+
+        :param parts: SEQUENCES OF MESSAGES, IN ORDER.
+        """
+        self._parts = parts
+
+    def __iter__(self) -> Iterator[Message]:
+        return chain.from_iterable(self._parts)
+
+    def __len__(self) -> int:
+        return sum(len(part) for part in self._parts)
+
+    def __getitem__(self, idx: Union[int, slice]) -> Union[Message, List[Message]]:
+        if isinstance(idx, slice):
+            return list(self)[idx]
+        if idx < 0:
+            idx += len(self)
+        if idx >= 0:
+            for part in self._parts:
+                if idx < len(part):
+                    return part[idx]
+                idx -= len(part)
+        raise IndexError("CHAINVIEW INDEX OUT OF RANGE")
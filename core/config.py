@@ -4,8 +4,15 @@ class Config:
     
     CAN BE EXTENDED TO ADD CUSTOM PARAMETERS.
     STORES PARAMETERS AS A DICTIONARY FOR FLEXIBILITY.
+    
+    version INCREASES ON EVERY set() SO CONSUMERS CAN CACHE VALUES AND
+    RE-READ THEM ONLY WHEN THE CONFIG ACTUALLY CHANGED. UPDATE PARAMETERS THROUGH
+    set() RATHER THAN MUTATING self.params DIRECTLY.
     """
 
+    # CLASS-LEVEL DEFAULT SO SUBCLASSES THAT SKIP super().__init__ STILL HAVE A VERSION
+    _version = 0
+
     def __init__(self, **kwargs):
         """
         INITIALIZE CONFIG WITH ARBITRARY KEY-VALUE PARAMETERS.
@@ -14,6 +21,13 @@ class Config:
         """
         self.params = kwargs
 
+    @property
+    def version(self) -> int:
+        """
+        NUMBER OF set() CALLS SO FAR; CHANGES WHENEVER A PARAMETER IS UPDATED.
+        """
+        return self._version
+
     def get(self, key, default=None):
         """
         GET A CONFIG PARAMETER BY KEY, RETURN default IF NOT FOUND.
@@ -25,6 +39,7 @@ class Config:
         SET OR UPDATE A CONFIG PARAMETER.
         """
         self.params[key] = value
+        self._version += 1
 
     def to_dict(self):
         """
@@ -1,7 +1,25 @@
+import asyncio
+import bisect
 from abc import ABC, abstractmethod
-from typing import List
-from .message import Message
+from collections import deque
+from typing import AsyncIterator, Deque, Iterable, List, Optional, Sequence, Tuple, Union
+from .message import Message, ROLE_IDS
 from .config import Config
+from .serialization import dumps
+from .chainview import ChainView
+
+
+class _ContextEntry:
+    """
+    BOOKKEEPING FOR ONE MESSAGE IN AN LLM's CONTEXT: ITS SIZE, PIN STATE AND APPEND SEQUENCE NUMBER.
+    """
+    __slots__ = ("size", "pinned", "seq")
+
+    def __init__(self, size: int, pinned: bool, seq: int):
+        self.size = size
+        self.pinned = pinned
+        self.seq = seq
+
 
 class LLM(ABC):
     """
@@ -15,27 +33,332 @@ class LLM(ABC):
         INITIALIZE THE LLM WITH A CONFIG OBJECT.
         
         :param config: Config instance holding model-specific parameters.
+        
+        self.lock SERIALIZES CONVERSATIONS ON THIS INSTANCE WITHOUT BLOCKING OTHER INSTANCES.
+        
+        CONTEXT SIZE IS BOUNDED BY THESE OPTIONAL CONFIG PARAMETERS:
+        - max_context_bytes: UTF-8 BYTE BUDGET FOR ALL MESSAGE CONTENTS (DEFAULT: UNBOUNDED).
+        - max_context_messages: MAXIMUM NUMBER OF MESSAGES KEPT (DEFAULT: UNBOUNDED).
+        THE OLDEST MESSAGES ARE EVICTED FIRST. SYSTEM MESSAGES AND PINNED MESSAGES ARE NEVER EVICTED.
+        
+        COLD MESSAGES CAN BE COMPRESSED IN MEMORY INSTEAD OF EVICTED:
+        - compress_after_messages: COMPRESS A MESSAGE ONCE THIS MANY MESSAGES HAVE BEEN APPENDED AFTER IT
+          (DEFAULT: NEVER). A PROMPT AND ITS REPLY COUNT AS TWO MESSAGES.
+        - compress_min_bytes: SKIP MESSAGES SMALLER THAN THIS (DEFAULT 256).
+        COMPRESSION CHANGES THE Message OBJECT ITSELF, SO A MESSAGE SHARED THROUGH Message.get (E.G., A
+        COMMON SYSTEM PROMPT) IS ALSO COMPRESSED FOR THE OTHER INSTANCES HOLDING IT. IT STAYS READABLE
+        THERE, BUT ITS CONTENT IS THEN DECOMPRESSED ON EVERY READ.
         """
         self.config = config
-        self.context: List[Message] = []
+        self._context: Deque[Message] = deque()
+        self._context_view = ChainView(self._context)
+        self.lock = asyncio.Lock()
+        self._context_entries: Deque[_ContextEntry] = deque()
+        self._context_bytes = 0
+        self._appended = 0
+        # INDEX OF THE OLDEST MESSAGE NOT YET CONSIDERED FOR COMPRESSION
+        self._compress_cursor = 0
+        # COMMA-SEPARATED JSON OF self.context, BUILT BY THE FIRST encode_request AND THEN KEPT IN
+        # STEP WITH append_message; None UNTIL THEN, AFTER EVICTION, AND WHILE COMPRESSION IS ENABLED
+        self._encoded_tail: Optional[bytearray] = None
+        self._cfg_key = None
+        self._refresh_config()
+        self._request_prefix_key = None
+        self._request_prefix = b""
+
+    @property
+    def context(self) -> ChainView:
+        """
+        READ-ONLY VIEW OF THE CONTEXT MESSAGES, OLDEST FIRST.
+        
+        CHANGE THE CONTEXT THROUGH append_message, pop_messages, reset_context OR BY ASSIGNING
+        A NEW LIST OF MESSAGES, SO THE SIZE BOOKKEEPING AND THE ENCODED BUFFER STAY IN STEP WITH IT.
+        """
+        return self._context_view
+
+    @context.setter
+    def context(self, messages: Iterable[Message]):
+        """
+        REPLACE THE CONTEXT WITH messages, APPENDING THEM IN ORDER.
+        
+        THE SAME BUDGET AND COMPRESSION RULES AS append_message APPLY, AND PINS ARE CLEARED.
+        """
+        messages = list(messages)
+        self.reset_context()
+        for message in messages:
+            self.append_message(message)
 
     @abstractmethod
-    async def generate(self, messages: List[Message]) -> str:
+    async def generate(self, messages: Sequence[Message]) -> str:
         """
-        ABSTRACT METHOD TO GENERATE A RESPONSE GIVEN A LIST OF MESSAGES.
+        ABSTRACT METHOD TO GENERATE A RESPONSE GIVEN A SEQUENCE OF MESSAGES.
         
-        MUST BE OVERRIDDEN BY SUBCLASSES.
+        MUST BE OVERRIDDEN BY SUBCLASSES. messages MAY BE THE LIVE CONTEXT OR A VIEW OVER IT,
+        SO IMPLEMENTATIONS MUST ONLY READ IT (ITERATE, len(), INDEX), NEVER MUTATE IT.
         
-        :param messages: List of Message objects representing the conversation context.
+        :param messages: Sequence of Message objects representing the conversation context.
         :return: Generated response string.
         """
         pass
 
+    async def generate_stream(self, messages: Sequence[Message]) -> AsyncIterator[str]:
+        """
+        GENERATE A RESPONSE INCREMENTALLY, YIELDING TEXT CHUNKS AS THEY ARRIVE.
+        
+        OVERRIDE IN SUBCLASSES WHOSE PROVIDER SUPPORTS STREAMING (E.G., SERVER-SENT EVENTS).
+        DEFAULT IMPLEMENTATION YIELDS THE FULL RESULT OF generate AS A SINGLE CHUNK.
+        
+        :param messages: Sequence of Message objects representing the conversation context.
+        :return: Async iterator of response text chunks.
+        """
+        yield await self.generate(messages)
+
+    def request_fields(self) -> dict:
+        """
+        RETURN THE FIXED PER-INSTANCE FIELDS OF A REQUEST BODY (E.G., model, temperature, max_tokens).
+        
+        OVERRIDE IN SUBCLASSES THAT BUILD REQUESTS WITH encode_request. MUST DEPEND ONLY ON
+        self.config, SINCE THE ENCODED RESULT IS CACHED UNTIL THE CONFIG CHANGES OR IS REPLACED.
+        
+        :return: JSON-compatible dict, without a "messages" key.
+        """
+        return {}
+
+    def encode_request(self, messages: Sequence[Message]) -> bytes:
+        """
+        ENCODE A CHAT-COMPLETION REQUEST BODY: request_fields() PLUS THE "messages" ARRAY.
+        
+        THE FIXED FIELDS ARE SERIALIZED ONCE INTO A BYTE PREFIX AND REUSED UNTIL THE CONFIG IS
+        REPLACED OR ITS VERSION CHANGES, AND EACH MESSAGE REUSES ITS OWN MEMOIZED ENCODING. WHEN
+        messages IS self.context (OR A ChainView STARTING WITH IT), THE CONTEXT'S RUNNING ENCODED
+        BUFFER IS SENT AS-IS AND ONLY THE EXTRA MESSAGES ARE ENCODED.
+        
+        :param messages: Sequence of Message objects representing the conversation context.
+        :return: UTF-8 JSON bytes, ready to send as the HTTP request body.
+        """
+        config = self.config
+        if self._request_prefix_key != (config, config.version):
+            fields = dumps(self.request_fields())
+            separator = b"," if fields != b"{}" else b""
+            self._request_prefix = fields[:-1] + separator + b'"messages":'
+            self._request_prefix_key = (config, config.version)
+        if messages is self.context:
+            parts = [self._context_tail()]
+        elif isinstance(messages, ChainView) and messages._parts and messages._parts[0] is self.context:
+            parts = [self._context_tail()]
+            parts.extend(message.json_bytes() for part in messages._parts[1:] for message in part)
+        else:
+            return self._request_prefix + self.encode_messages(messages) + b"}"
+        return self._request_prefix + b"[" + b",".join(part for part in parts if part) + b"]}"
+
+    def _context_tail(self) -> Union[bytes, bytearray]:
+        """
+        RETURN THE COMMA-SEPARATED JSON OF self.context, WITHOUT BRACKETS.
+        
+        THE BUFFER IS BUILT ON FIRST USE, SO MODELS THAT NEVER CALL encode_request DO NOT PAY FOR IT,
+        AND REBUILT ONLY AFTER EVICTION. IT IS NOT KEPT WHEN COLD-MESSAGE COMPRESSION IS ENABLED,
+        SINCE IT WOULD HOLD EVERY MESSAGE UNCOMPRESSED.
+        """
+        if self._compress_after_messages is not None:
+            return b",".join(message.json_bytes() for message in self._context)
+        if self._encoded_tail is None:
+            self._encoded_tail = bytearray(b",".join(message.json_bytes() for message in self._context))
+        return self._encoded_tail
+
+    @staticmethod
+    def encode_messages(messages: Sequence[Message]) -> bytes:
+        """
+        ENCODE THE "messages" ARRAY BY JOINING EACH MESSAGE'S MEMOIZED JSON BYTES.
+        
+        :param messages: Sequence of Message objects representing the conversation context.
+        :return: UTF-8 JSON bytes of the array.
+        """
+        return b"[" + b",".join(message.json_bytes() for message in messages) + b"]"
+
+    @classmethod
+    def provider_key(cls) -> Optional[str]:
+        """
+        RETURN A KEY IDENTIFYING THE PROVIDER ENDPOINT THIS MODEL CLASS TALKS TO.
+        
+        CALLERS CAN GROUP INSTANCES WHOSE CLASSES SHARE A KEY AND SEND THEM TOGETHER THROUGH
+        generate_batch. DEFAULT IS None, MEANING THE CLASS DOES NOT SUPPORT BATCHING.
+        
+        :return: Provider key string or None.
+        """
+        return None
+
+    @classmethod
+    async def generate_batch(
+        cls, requests: List[Tuple["LLM", Sequence[Message]]]
+    ) -> List[Union[str, BaseException]]:
+        """
+        GENERATE RESPONSES FOR SEVERAL INSTANCES OF THE SAME PROVIDER IN ONE ROUND-TRIP.
+        
+        OVERRIDE IN SUBCLASSES WHOSE PROVIDER SUPPORTS BATCHING OR MULTIPLEXING REQUESTS. THE
+        CALLER IS RESPONSIBLE FOR HOLDING EACH INSTANCE'S lock. DEFAULT IMPLEMENTATION FALLS BACK
+        TO CALLING generate ON EACH INSTANCE CONCURRENTLY.
+        
+        :param requests: List of (instance, messages) pairs.
+        :return: Responses in the same order as requests; failed entries hold the raised exception.
+        """
+        return await asyncio.gather(
+            *(llm.generate(messages) for llm, messages in requests),
+            return_exceptions=True
+        )
+
+    @classmethod
+    async def aclose(cls):
+        """
+        RELEASE ANY RESOURCES SHARED BY ALL INSTANCES OF THIS MODEL CLASS.
+        
+        OVERRIDE IN SUBCLASSES THAT HOLD CLASS-LEVEL RESOURCES (E.G., A POOLED HTTP CLIENT
+        REUSED ACROSS generate CALLS). DEFAULT IMPLEMENTATION DOES NOTHING.
+        """
+        pass
+
+    def _refresh_config(self):
+        """
+        RE-READ CONTEXT SETTINGS FROM self.config ONLY WHEN IT WAS REPLACED OR ITS VERSION HAS CHANGED.
+        
+        KEEPS THE PER-MESSAGE HOT PATH ON PLAIN ATTRIBUTE LOADS INSTEAD OF DICT LOOKUPS.
+        """
+        config = self.config
+        if self._cfg_key == (config, config.version):
+            return
+        self._max_context_bytes = self.config.get("max_context_bytes")
+        self._max_context_messages = self.config.get("max_context_messages")
+        self._compress_after_messages = self.config.get("compress_after_messages")
+        self._compress_min_bytes = self.config.get("compress_min_bytes", 256)
+        if self._compress_after_messages is not None:
+            self._encoded_tail = None
+        self._cfg_key = (config, config.version)
+
+    def append_message(self, message: Message):
+        """
+        APPEND A MESSAGE TO THE CONTEXT, EVICTING OLDER MESSAGES IF THE BUDGET IS EXCEEDED.
+        
+        :param message: Message to store in the context.
+        """
+        self._refresh_config()
+        self._appended += 1
+        self._context.append(message)
+        if self._encoded_tail is not None:
+            if self._encoded_tail:
+                self._encoded_tail += b","
+            self._encoded_tail += message.json_bytes()
+        self._context_entries.append(_ContextEntry(
+            len(message.content.encode("utf-8")),
+            message.role_id == ROLE_IDS["system"],
+            self._appended
+        ))
+        self._context_bytes += self._context_entries[-1].size
+        self.enforce_context_budget()
+        self._compress_cold_messages()
+
+    def pin(self, message_idx: int):
+        """
+        PROTECT THE MESSAGE AT message_idx FROM EVICTION.
+        
+        :param message_idx: Index of the message in self.context.
+        """
+        self._context_entries[message_idx].pinned = True
+
+    def enforce_context_budget(self, reserve_bytes: int = 0):
+        """
+        EVICT UNPINNED MESSAGES UNTIL THE CONTEXT FITS ITS CONFIGURED BUDGET.
+        
+        :param reserve_bytes: Extra bytes that must also fit (E.G., A PROMPT ABOUT TO BE SAVED).
+        """
+        victims = self._eviction_victims(reserve_bytes)
+        self._compress_cursor -= bisect.bisect_left(victims, self._compress_cursor)
+        for idx in reversed(victims):
+            self._context_bytes -= self._context_entries[idx].size
+            del self._context_entries[idx]
+            del self._context[idx]
+        if victims:
+            self._encoded_tail = None
+
+    def context_within_budget(self, reserve_bytes: int = 0) -> Sequence[Message]:
+        """
+        RETURN THE MESSAGES THAT FIT THE CONFIGURED BUDGET, WITHOUT EVICTING ANYTHING.
+        
+        USED FOR ONE-OFF REQUESTS THAT MUST NOT CHANGE THE STORED HISTORY. RETURNS self.context
+        ITSELF WHEN IT ALREADY FITS, OTHERWISE A LIST WITH THE WOULD-BE VICTIMS LEFT OUT.
+        
+        :param reserve_bytes: Extra bytes that must also fit (E.G., A PROMPT ABOUT TO BE SENT).
+        :return: Sequence of Message objects to send.
+        """
+        victims = self._eviction_victims(reserve_bytes)
+        if not victims:
+            return self.context
+        skipped = set(victims)
+        return [message for idx, message in enumerate(self._context) if idx not in skipped]
+
+    def _eviction_victims(self, reserve_bytes: int = 0) -> List[int]:
+        """
+        RETURN THE INDEXES OF THE MESSAGES TO EVICT TO FIT THE BUDGET, OLDEST UNPINNED FIRST.
+        
+        STOPS EARLY IF ONLY PINNED MESSAGES REMAIN.
+        """
+        self._refresh_config()
+        max_bytes = self._max_context_bytes
+        max_messages = self._max_context_messages
+        excess_bytes = self._context_bytes + reserve_bytes - max_bytes if max_bytes is not None else 0
+        excess_messages = len(self._context) - max_messages if max_messages is not None else 0
+        victims = []
+        for idx, entry in enumerate(self._context_entries):
+            if excess_bytes <= 0 and excess_messages <= 0:
+                break
+            if not entry.pinned:
+                victims.append(idx)
+                excess_bytes -= entry.size
+                excess_messages -= 1
+        return victims
+
+    def _compress_cold_messages(self):
+        """
+        MOVE MESSAGES WITH AT LEAST compress_after_messages NEWER MESSAGES TO THE COMPRESSED TIER.
+        
+        MESSAGES AGE IN INSERTION ORDER, SO A CURSOR ADVANCES PAST EACH ONE ONCE INSTEAD OF
+        RESCANNING THE WHOLE CONTEXT ON EVERY APPEND.
+        """
+        after_messages = self._compress_after_messages
+        if after_messages is None:
+            return
+        min_bytes = self._compress_min_bytes
+        entries = self._context_entries
+        idx = self._compress_cursor
+        while idx < len(entries) and self._appended - entries[idx].seq >= after_messages:
+            self._context[idx].compress(min_bytes)
+            idx += 1
+        self._compress_cursor = idx
+
+    def pop_messages(self, count: int = 1) -> List[Message]:
+        """
+        REMOVE THE LAST count MESSAGES FROM THE CONTEXT (E.G., TO RETRY OR UNDO A TURN).
+        
+        :param count: Number of messages to remove; fewer are removed if the context is shorter.
+        :return: The removed messages, oldest first.
+        """
+        removed = []
+        for _ in range(min(count, len(self._context))):
+            removed.append(self._context.pop())
+            self._context_bytes -= self._context_entries.pop().size
+        self._compress_cursor = min(self._compress_cursor, len(self._context))
+        if removed:
+            self._encoded_tail = None
+        removed.reverse()
+        return removed
+
     def reset_context(self):
         """
         CLEAR THE CONTEXT MESSAGES.
         """
-        self.context.clear()
+        self._context.clear()
+        self._context_entries.clear()
+        self._context_bytes = 0
+        self._compress_cursor = 0
+        self._encoded_tail = None
 
     def update_config(self, **kwargs):
         """
@@ -1,4 +1,7 @@
 import asyncio
+import sys
+from typing import AsyncIterator, Sequence
+from .chainview import ChainView
 from .message import Message
 from .config import Config
 from .llm import LLM
@@ -34,21 +37,33 @@ class LLMManager:
             raise ValueError(f"MODEL CLASS '{model_class.__name__}' ALREADY REGISTERED.")
         self.model_catalog[model_class] = model_class
 
-    def instantiate_model(self, instance_id: str, model_type: type[LLM], config: Config):
+    def instantiate_model(
+        self,
+        instance_id: str,
+        model_type: type[LLM],
+        config: Config,
+        system_prompt: str | None = None
+    ):
         """
         CREATE A NEW LLM INSTANCE OF GIVEN TYPE WITH PROVIDED CONFIGURATION.
 
         :PARAM instance_id: UNIQUE IDENTIFIER FOR THE NEW MODEL INSTANCE.
         :PARAM model_type: LLM CLASS TO INSTANTIATE (MUST BE REGISTERED).
         :PARAM config: CONFIG OBJECT REQUIRED TO INITIALIZE THE MODEL.
+        :PARAM system_prompt: OPTIONAL SYSTEM MESSAGE TO SEED THE CONTEXT WITH. IDENTICAL
+            SYSTEM PROMPTS ARE SHARED ACROSS INSTANCES RATHER THAN COPIED.
 
         :RAISES ValueError: IF model_type IS NOT REGISTERED OR instance_id ALREADY EXISTS.
         """
-        if model_type not in self.model_catalog:
+        model_class = self.model_catalog.get(model_type)
+        if model_class is None:
             raise ValueError(f"MODEL CLASS '{model_type.__name__}' IS NOT REGISTERED.")
         if instance_id in self.model_instances:
             raise ValueError(f"INSTANCE ID '{instance_id}' ALREADY EXISTS.")
-        self.model_instances[instance_id] = model_type(config)
+        llm = model_class(config)
+        if system_prompt is not None:
+            llm.append_message(Message.get("system", system_prompt))
+        self.model_instances[instance_id] = llm
 
     def remove_model(self, instance_id: str):
         """
@@ -58,9 +73,21 @@ class LLMManager:
 
         DOES NOTHING IF INSTANCE ID DOES NOT EXIST.
         """
-        if instance_id in self.model_instances:
-            self.model_instances[instance_id].reset_context()
-            del self.model_instances[instance_id]
+        llm = self.model_instances.pop(instance_id, None)
+        if llm is not None:
+            llm.reset_context()
+
+    async def shutdown(self):
+        """
+        REMOVE ALL MODEL INSTANCES AND RELEASE CLASS-LEVEL RESOURCES OF EVERY REGISTERED MODEL TYPE.
+
+        CALLS aclose() ONCE PER REGISTERED MODEL CLASS SO SHARED CONNECTION POOLS ARE CLOSED
+        ONLY AFTER NO INSTANCE CAN USE THEM ANYMORE.
+        """
+        for instance_id in self.get_model_instances():
+            self.remove_model(instance_id)
+        for model_class in self.model_catalog:
+            await model_class.aclose()
 
     async def use_model(
         self,
@@ -82,23 +109,82 @@ class LLMManager:
         :RETURNS: GENERATED RESPONSE FROM THE MODEL.
 
         :RAISES ValueError: IF instance_id IS NOT FOUND.
+
+        CONCURRENT CALLS ON THE SAME INSTANCE ARE QUEUED ON ITS LOCK SO CONTEXT STAYS CONSISTENT;
+        CALLS ON DIFFERENT INSTANCES RUN FULLY IN PARALLEL.
         """
-        if instance_id not in self.model_instances:
+        llm = self.model_instances.get(instance_id)
+        if llm is None:
             raise ValueError(f"INSTANCE '{instance_id}' NOT FOUND.")
-        llm = self.model_instances[instance_id]
 
-        context_to_use = llm.context.copy()
-        if append_prompt:
-            context_to_use.append(Message(role, prompt))
+        prompt_message = Message(role, prompt) if append_prompt else None
+        async with llm.lock:
+            context_to_use = self._build_context(llm, prompt_message)
+            response = await llm.generate(context_to_use)
+            self._save_context(llm, prompt_message, response, save_context)
 
-        response = await llm.generate(context_to_use)
+        return response
 
-        if save_context:
-            if append_prompt:
-                llm.context.append(Message(role, prompt))
-            llm.context.append(Message("assistant", response))
+    async def use_model_stream(
+        self,
+        instance_id: str,
+        prompt: str,
+        role: str = "user",
+        save_context: bool = False,
+        append_prompt: bool = False
+    ) -> AsyncIterator[str]:
+        """
+        SEND A PROMPT TO THE SPECIFIED MODEL INSTANCE AND YIELD THE RESPONSE AS IT IS GENERATED.
 
-        return response
+        TAKES THE SAME PARAMETERS AS use_model. THE FULL RESPONSE IS SAVED TO CONTEXT ONLY AFTER
+        THE STREAM COMPLETES. THE INSTANCE LOCK IS HELD WHILE STREAMING, SO CLOSE AN ABANDONED
+        STREAM (E.G., WITH contextlib.aclosing) TO RELEASE IT PROMPTLY.
+
+        :YIELDS: RESPONSE TEXT CHUNKS.
+
+        :RAISES ValueError: IF instance_id IS NOT FOUND.
+        """
+        llm = self.model_instances.get(instance_id)
+        if llm is None:
+            raise ValueError(f"INSTANCE '{instance_id}' NOT FOUND.")
+
+        prompt_message = Message(role, prompt) if append_prompt else None
+        async with llm.lock:
+            context_to_use = self._build_context(llm, prompt_message)
+            chunks = []
+            async for chunk in llm.generate_stream(context_to_use):
+                chunks.append(chunk)
+                yield chunk
+            self._save_context(llm, prompt_message, "".join(chunks), save_context)
+
+    def _build_context(self, llm: LLM, prompt_message: Message | None) -> Sequence[Message]:
+        """
+        BUILD THE MESSAGES TO SEND TO llm, APPENDING prompt_message IF GIVEN.
+
+        RETURNS llm.context ITSELF OR A ChainView OVER IT; NEITHER COPIES THE HISTORY. IF THE
+        CONTEXT PLUS PROMPT EXCEEDS THE BUDGET, THE OLDEST UNPINNED MESSAGES ARE LEFT OUT OF THE
+        REQUEST BUT STAY STORED; THEY ARE ONLY EVICTED WHEN THE PROMPT IS SAVED TO CONTEXT.
+        MUST BE CALLED WITH llm.lock HELD SO THE CONTEXT IS NOT MUTATED DURING GENERATION.
+        """
+        if prompt_message is None:
+            return llm.context_within_budget()
+        context = llm.context_within_budget(len(prompt_message.content.encode("utf-8")))
+        return ChainView(context, (prompt_message,))
+
+    def _save_context(
+        self,
+        llm: LLM,
+        prompt_message: Message | None,
+        response: str,
+        save_context: bool
+    ):
+        """
+        STORE THE PROMPT (IF APPENDED) AND RESPONSE IN llm's CONTEXT WHEN save_context IS SET.
+        """
+        if save_context:
+            if prompt_message is not None:
+                llm.append_message(prompt_message)
+            llm.append_message(Message("assistant", response))
 
     async def use_multiple_models(
         self,
@@ -119,16 +205,72 @@ class LLMManager:
 
         :RETURNS: DICTIONARY MAPPING INSTANCE IDS TO RESPONSES OR ERROR MESSAGES.
         """
-        tasks = {
-            instance_id: self.use_model(instance_id, prompt, role, save_context, append_prompt)
-            for instance_id in instance_ids
-        }
-        results = await asyncio.gather(*tasks.values(), return_exceptions=True)
+        instance_ids = list(dict.fromkeys(instance_ids))
+        tasks = self._schedule_multiple(instance_ids, prompt, role, save_context, append_prompt)
+        # gather (UNLIKE wait) CANCELS THE TASKS IF THIS CALL IS CANCELLED
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        return {instance_id: self._collect_task_result(task) for task, instance_id in tasks.items()}
+
+    async def use_multiple_models_streaming(
+        self,
+        instance_ids: list[str],
+        prompt: str,
+        role: str = "user",
+        save_context: bool = False,
+        append_prompt: bool = False,
+    ) -> AsyncIterator[tuple[str, str]]:
+        """
+        SEND A PROMPT TO MULTIPLE MODEL INSTANCES IN PARALLEL AND YIELD EACH RESPONSE AS IT ARRIVES.
+
+        TAKES THE SAME PARAMETERS AS use_multiple_models. A SLOW OR FAILING INSTANCE DOES NOT
+        DELAY THE OTHERS. IF THE CALLER STOPS ITERATING EARLY, UNFINISHED REQUESTS ARE CANCELLED.
+
+        :YIELDS: (instance_id, response OR ERROR MESSAGE) TUPLES IN COMPLETION ORDER.
+        """
+        instance_ids = list(dict.fromkeys(instance_ids))
+        tasks = self._schedule_multiple(instance_ids, prompt, role, save_context, append_prompt)
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield tasks[task], self._collect_task_result(task)
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def _schedule_multiple(
+        self,
+        instance_ids: list[str],
+        prompt: str,
+        role: str,
+        save_context: bool,
+        append_prompt: bool
+    ) -> dict[asyncio.Task, str]:
+        """
+        START ONE TASK PER INSTANCE WITHOUT AWAITING ANY OF THEM.
+
+        :RETURNS: DICTIONARY MAPPING EACH TASK TO THE INSTANCE ID IT ANSWERS FOR.
+        """
+        # SCHEDULE EVERY REQUEST BEFORE AWAITING ANY RESULT SO ALL NETWORK I/O OVERLAPS
         return {
-            instance_id: result if not isinstance(result, Exception) else f"ERROR: {result}"
-            for instance_id, result in zip(tasks.keys(), results)
+            asyncio.create_task(
+                self.use_model(instance_id, prompt, role, save_context, append_prompt)
+            ): instance_id
+            for instance_id in instance_ids
         }
 
+    @staticmethod
+    def _collect_task_result(task: asyncio.Task) -> str:
+        """
+        TURN A FINISHED TASK FROM _schedule_multiple INTO ITS RESPONSE OR AN ERROR MESSAGE.
+        """
+        try:
+            return task.result()
+        except Exception as e:
+            return f"ERROR: {e}"
+
     def get_model_catalog(self) -> list[str]:
         """
         RETURN A LIST OF ALL SUPPORTED MODEL CLASSES AVAILABLE FOR INSTANTIATION.
@@ -153,21 +295,31 @@ class LLMManager:
 
         :RAISES ValueError: IF INSTANCE DOES NOT EXIST.
         """
-        if instance_id not in self.model_instances:
-            raise ValueError(f"INSTANCE '{instance_id}' NOT FOUND.")
-
-        context = self.model_instances[instance_id].context
-        print(f"--- CONVERSATION HISTORY FOR '{instance_id}' ---")
-        for message in context:
-            role = message.role.upper()
-            print(f"{role}: {message.content}")
-        print("--- END CONVERSATION ---")
+        sys.stdout.write(self._format_conversation_history(instance_id))
 
     def print_all_conversation_histories(self):
         """
         PRINT ALL CONVERSATION HISTORIES FOR EVERY MODEL INSTANCE.
+
+        ALL HISTORIES ARE BUILT FIRST AND WRITTEN TO STDOUT IN A SINGLE CALL.
         """
-        print("\n")
+        parts = ["\n\n"]
         for instance_id in self.get_model_instances():
-            self.print_conversation_history(instance_id)
-            print("\n")
+            parts.append(self._format_conversation_history(instance_id))
+            parts.append("\n\n")
+        sys.stdout.write("".join(parts))
+
+    def _format_conversation_history(self, instance_id: str) -> str:
+        """
+        RETURN THE TEXT PRINTED BY print_conversation_history, AS ONE STRING.
+
+        :RAISES ValueError: IF INSTANCE DOES NOT EXIST.
+        """
+        llm = self.model_instances.get(instance_id)
+        if llm is None:
+            raise ValueError(f"INSTANCE '{instance_id}' NOT FOUND.")
+
+        lines = [f"--- CONVERSATION HISTORY FOR '{instance_id}' ---"]
+        lines.extend(f"{message.role.upper()}: {message.content}" for message in llm.context)
+        lines.append("--- END CONVERSATION ---\n")
+        return "\n".join(lines)
@@ -1,9 +1,52 @@
+import sys
+import weakref
+import zlib
+from .serialization import dumps
+
+# ROLES ARE STORED AS SMALL INTEGER IDS; EACH ROLE STRING EXISTS ONCE, INTERNED, IN _ROLE_STRS.
+# UNKNOWN ROLES (E.G., 'tool') ARE REGISTERED ON FIRST USE.
+ROLE_IDS = {"user": 0, "assistant": 1, "system": 2}
+_ROLE_STRS = ["user", "assistant", "system"]
+
+
+# FLYWEIGHT TABLE FOR Message.get: (ROLE ID, CONTENT HASH) -> LIVE SHARED MESSAGE.
+# KEYED BY HASH RATHER THAN CONTENT SO A COMPRESSED SHARED MESSAGE DOES NOT PIN ITS RAW TEXT.
+_SHARED_MESSAGES: "weakref.WeakValueDictionary[tuple[int, int], Message]" = weakref.WeakValueDictionary()
+
+
+def role_id(role: str) -> int:
+    """
+    RETURN THE INTEGER ID FOR role, REGISTERING IT IF IT HAS NOT BEEN SEEN BEFORE.
+    
+    :param role: ROLE STRING (E.G., 'user', 'assistant', 'system').
+    :return: INTEGER ROLE ID.
+    """
+    rid = ROLE_IDS.get(role)
+    if rid is None:
+        rid = len(_ROLE_STRS)
+        _ROLE_STRS.append(sys.intern(role))
+        ROLE_IDS[_ROLE_STRS[rid]] = rid
+    return rid
+
+
 class Message:
     """
     REPRESENTS A SINGLE MESSAGE IN A CHAT CONTEXT.
     
     INCLUDES WHO SENT THE MESSAGE (ROLE) AND THE TEXT CONTENT.
+    
+    MESSAGES ARE IMMUTABLE (ASSIGNING AN ATTRIBUTE RAISES AttributeError), SO THEIR PROVIDER
+    JSON ENCODING IS BUILT ON FIRST USE AND REUSED ON EVERY TURN INSTEAD OF BEING REBUILT FOR
+    THE WHOLE CONVERSATION.
+    
+    COLD MESSAGES CAN BE MOVED TO A COMPRESSED TIER WITH compress(); THEIR CONTENT IS THEN
+    DECOMPRESSED ON DEMAND EACH TIME IT IS READ.
+    
+    USES __slots__ TO DROP THE PER-INSTANCE __dict__, SINCE HISTORIES CAN HOLD THOUSANDS OF MESSAGES,
+    AND STORES THE ROLE AS AN INTEGER ID RATHER THAN A PER-MESSAGE STRING.
     """
+    __slots__ = ("role_id", "_content", "_compressed", "_json_bytes", "__weakref__")
+
     def __init__(self, role: str, content: str):
         """
         INITIALIZE A MESSAGE OBJECT.
@@ -11,5 +54,105 @@ class Message:
         :param role: WHO SENT THE MESSAGE (E.G., 'user', 'assistant', 'system').
         :param content: THE TEXT CONTENT OF THE MESSAGE.
         """
-        self.role = role
-        self.content = content
\ No newline at end of file
+        rid = role_id(role)
+        _set = object.__setattr__
+        _set(self, "role_id", rid)
+        _set(self, "_content", content)
+        _set(self, "_compressed", None)
+        _set(self, "_json_bytes", None)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("MESSAGE IS IMMUTABLE.")
+
+    def __delattr__(self, name):
+        raise AttributeError("MESSAGE IS IMMUTABLE.")
+
+    def __copy__(self):
+        # IMMUTABLE, SO A COPY CAN BE THE MESSAGE ITSELF (AS FOR str AND tuple)
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return (Message, (self.role, self.materialize()))
+
+    @classmethod
+    def get(cls, role: str, content: str) -> "Message":
+        """
+        RETURN A SHARED MESSAGE FOR (role, content), CREATING IT IF NO LIVE ONE EXISTS.
+        
+        IDENTICAL MESSAGES USED BY SEVERAL INSTANCES (E.G., A COMMON SYSTEM PROMPT) THEN SHARE
+        ONE OBJECT, ITS ENCODING AND ANY COMPRESSED FORM. SHARED MESSAGES ARE FREED WITH THEIR LAST USER.
+        
+        :param role: WHO SENT THE MESSAGE (E.G., 'user', 'assistant', 'system').
+        :param content: THE TEXT CONTENT OF THE MESSAGE.
+        """
+        key = (role_id(role), hash(content))
+        message = _SHARED_MESSAGES.get(key)
+        if message is None or message.materialize() != content:
+            message = cls(role, content)
+            _SHARED_MESSAGES[key] = message
+        return message
+
+    @property
+    def role(self) -> str:
+        """
+        WHO SENT THE MESSAGE, AS THE SHARED INTERNED ROLE STRING.
+        """
+        return _ROLE_STRS[self.role_id]
+
+    @property
+    def content(self) -> str:
+        """
+        THE TEXT CONTENT OF THE MESSAGE, DECOMPRESSED IF THE MESSAGE IS COLD.
+        """
+        return self.materialize()
+
+    @property
+    def is_compressed(self) -> bool:
+        """
+        TRUE IF THE CONTENT CURRENTLY LIVES IN THE COMPRESSED TIER.
+        """
+        return self._compressed is not None
+
+    def materialize(self) -> str:
+        """
+        RETURN THE CONTENT AS A STRING WITHOUT MOVING THE MESSAGE OUT OF THE COMPRESSED TIER.
+        """
+        if self._compressed is None:
+            return self._content
+        return zlib.decompress(self._compressed).decode("utf-8")
+
+    def json_bytes(self) -> bytes:
+        """
+        RETURN THE {"role": ..., "content": ...} DICT SENT TO PROVIDERS, ENCODED AS COMPACT UTF-8 JSON.
+        
+        HOT MESSAGES ENCODE ONCE AND REUSE THE BYTES; COLD MESSAGES ENCODE ON DEMAND SO THE
+        CACHE DOES NOT KEEP AN UNCOMPRESSED COPY OF THEIR CONTENT ALIVE.
+        """
+        if self._json_bytes is not None:
+            return self._json_bytes
+        encoded = dumps({"role": _ROLE_STRS[self.role_id], "content": self.materialize()})
+        if self._compressed is None:
+            object.__setattr__(self, "_json_bytes", encoded)
+        return encoded
+
+    def compress(self, min_bytes: int = 0):
+        """
+        MOVE THE CONTENT TO THE COMPRESSED TIER IF IT IS AT LEAST min_bytes LONG AND ACTUALLY SHRINKS.
+        
+        :param min_bytes: SMALLEST UTF-8 CONTENT SIZE WORTH COMPRESSING.
+        """
+        if self._compressed is not None:
+            return
+        raw = self._content.encode("utf-8")
+        if len(raw) < min_bytes:
+            return
+        compressed = zlib.compress(raw)
+        if len(compressed) >= len(raw):
+            return
+        _set = object.__setattr__
+        _set(self, "_compressed", compressed)
+        _set(self, "_content", None)
+        _set(self, "_json_bytes", None)
@@ -0,0 +1,171 @@
+"""
+REFERENCE PROVIDER FOR OpenRouter's OPENAI-COMPATIBLE CHAT COMPLETIONS API.
+
+SHOWS HOW A PROVIDER PLUGS INTO THE LLM HOOKS: request_fields + encode_request BUILD THE
+REQUEST BODY FROM CACHED BYTES, AND ONE POOLED HTTP CLIENT IS SHARED BY ALL INSTANCES AND
+RELEASED THROUGH aclose(). REQUIRES httpx (pip install llmmanager[openrouter]).
+"""
+import asyncio
+from types import MappingProxyType
+from typing import AsyncIterator, Mapping, Sequence, Tuple
+from .config import Config
+from .llm import LLM
+from .message import Message
+from .retry import retry
+from .serialization import loads
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+try:
+    import h2  # noqa: F401 (ENABLES HTTP/2 IN httpx)
+except ImportError:
+    h2 = None
+
+
+class OpenRouterLLM(LLM):
+    """
+    LLM BACKED BY OpenRouter's /chat/completions ENDPOINT.
+
+    CONFIG PARAMETERS:
+    - api_key: OpenRouter API KEY (REQUIRED).
+    - model: MODEL SLUG, E.G. "openai/gpt-4o-mini" (REQUIRED).
+    - max_tokens, temperature: SAMPLING PARAMETERS, SENT ONLY WHEN SET.
+    - base_url: API ROOT (DEFAULT "https://openrouter.ai/api/v1").
+    """
+    DEFAULT_BASE_URL = "https://openrouter.ai/api/v1"
+
+    # SHARED BY ALL INSTANCES (AND SUBCLASSES) SO CONNECTIONS ARE POOLED ACROSS generate CALLS.
+    # POOLED CONNECTIONS BELONG TO THE EVENT LOOP THEY WERE OPENED ON, SO THE LOOP IS KEPT TOO.
+    _client = None
+    _client_loop = None
+
+    def __init__(self, config: Config):
+        """
+        INITIALIZE THE MODEL.
+
+        :param config: Config instance holding api_key, model and optional sampling parameters.
+        :raises ImportError: If httpx is not installed.
+        """
+        if httpx is None:
+            raise ImportError("OpenRouterLLM REQUIRES httpx (pip install llmmanager[openrouter]).")
+        super().__init__(config)
+        self._endpoint_key = None
+        self._endpoint = ("", MappingProxyType({}))
+
+    @staticmethod
+    def client() -> "httpx.AsyncClient":
+        """
+        RETURN THE SHARED HTTP CLIENT FOR THE RUNNING EVENT LOOP.
+
+        A NEW CLIENT IS CREATED ON FIRST USE, AFTER aclose(), AND WHEN THE LOOP HAS CHANGED
+        (E.G., A SECOND asyncio.run), SINCE KEEP-ALIVE CONNECTIONS CANNOT OUTLIVE THEIR LOOP.
+        MUST BE CALLED FROM A COROUTINE.
+        """
+        loop = asyncio.get_running_loop()
+        client = OpenRouterLLM._client
+        if client is None or client.is_closed or OpenRouterLLM._client_loop is not loop:
+            client = OpenRouterLLM._client = OpenRouterLLM._new_client()
+            OpenRouterLLM._client_loop = loop
+        return client
+
+    @staticmethod
+    def _new_client() -> "httpx.AsyncClient":
+        """
+        CREATE THE POOLED HTTP CLIENT. HTTP/2 IS USED WHEN h2 IS INSTALLED SO CONCURRENT
+        REQUESTS SHARE CONNECTIONS.
+        """
+        return httpx.AsyncClient(
+            http2=h2 is not None,
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+            timeout=httpx.Timeout(60.0, connect=10.0),
+        )
+
+    def request_fields(self) -> dict:
+        """
+        RETURN THE model AND ANY CONFIGURED SAMPLING PARAMETERS.
+        """
+        fields = {"model": self.config.get("model")}
+        for key in ("max_tokens", "temperature"):
+            value = self.config.get(key)
+            if value is not None:
+                fields[key] = value
+        return fields
+
+    def endpoint(self) -> Tuple[str, Mapping[str, str]]:
+        """
+        RETURN THE COMPLETIONS URL AND THE (READ-ONLY) REQUEST HEADERS FOR THIS INSTANCE.
+
+        BUILT ONCE AND REBUILT ONLY WHEN THE CONFIG IS REPLACED OR ITS VERSION CHANGES, LIKE
+        THE ENCODED REQUEST PREFIX.
+        """
+        config = self.config
+        if self._endpoint_key != (config, config.version):
+            base_url = config.get("base_url", self.DEFAULT_BASE_URL)
+            self._endpoint = (
+                f"{base_url}/chat/completions",
+                MappingProxyType({
+                    "Authorization": f"Bearer {config.get('api_key')}",
+                    "Content-Type": "application/json",
+                }),
+            )
+            self._endpoint_key = (config, config.version)
+        return self._endpoint
+
+    @retry()
+    async def generate(self, messages: Sequence[Message]) -> str:
+        """
+        SEND THE CONVERSATION TO OpenRouter AND RETURN THE ASSISTANT's REPLY.
+
+        RATE LIMITS, 5XX RESPONSES AND TRANSPORT ERRORS ARE RETRIED WITH BACKOFF (SEE core.retry).
+
+        :param messages: Sequence of Message objects representing the conversation context.
+        :return: Generated response string.
+        :raises httpx.HTTPStatusError: If the API responds with an error status (after retries).
+        """
+        url, headers = self.endpoint()
+        response = await self.client().post(url, content=self.encode_request(messages), headers=headers)
+        response.raise_for_status()
+        return loads(response.content)["choices"][0]["message"]["content"]
+
+    async def generate_stream(self, messages: Sequence[Message]) -> AsyncIterator[str]:
+        """
+        SEND THE CONVERSATION WITH "stream": true AND YIELD THE REPLY AS SERVER-SENT EVENTS ARRIVE.
+
+        NOT RETRIED, SINCE CHUNKS MAY ALREADY HAVE BEEN YIELDED WHEN A STREAM FAILS.
+
+        :param messages: Sequence of Message objects representing the conversation context.
+        :return: Async iterator of response text chunks.
+        :raises httpx.HTTPStatusError: If the API responds with an error status.
+        """
+        url, headers = self.endpoint()
+        body = b'{"stream":true,' + self.encode_request(messages)[1:]
+        async with self.client().stream("POST", url, content=body, headers=headers) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                # SKIP BLANK SEPARATORS AND ": comment" KEEP-ALIVES
+                if not line.startswith("data:"):
+                    continue
+                data = line[5:].strip()
+                if data == "[DONE]":
+                    break
+                # THE FINAL USAGE CHUNK CAN ARRIVE WITH AN EMPTY choices LIST
+                choices = loads(data).get("choices")
+                content = choices[0].get("delta", {}).get("content") if choices else None
+                if content:
+                    yield content
+
+    @classmethod
+    async def aclose(cls):
+        """
+        CLOSE THE SHARED HTTP CLIENT. A LATER generate CALL OPENS A NEW ONE.
+
+        A CLIENT LEFT OVER FROM A FINISHED EVENT LOOP IS ONLY DROPPED, SINCE ITS CONNECTIONS
+        CAN NO LONGER BE CLOSED CLEANLY.
+        """
+        client, OpenRouterLLM._client = OpenRouterLLM._client, None
+        loop, OpenRouterLLM._client_loop = OpenRouterLLM._client_loop, None
+        if client is not None and loop is asyncio.get_running_loop():
+            await client.aclose()
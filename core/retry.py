@@ -0,0 +1,103 @@
+"""
+RETRY WITH EXPONENTIAL BACKOFF AND JITTER FOR PROVIDER CALLS.
+
+PROVIDERS DECORATE THEIR generate METHOD SO TRANSIENT FAILURES (RATE LIMITS, 5XX) ARE
+RETRIED IN PLACE INSTEAD OF FAILING THE WHOLE use_multiple_models CALL.
+"""
+import asyncio
+import functools
+import random
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+RETRYABLE_STATUS_CODES = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+# ERRORS RAISED BEFORE ANY RESPONSE ARRIVED (CONNECTION RESETS, TIMEOUTS) THAT ARE SAFE TO RETRY
+TRANSPORT_ERRORS: tuple[type[BaseException], ...] = (ConnectionError, TimeoutError, asyncio.TimeoutError)
+if httpx is not None:
+    TRANSPORT_ERRORS += (httpx.TransportError,)
+
+
+def retry_after_seconds(exc: BaseException) -> float | None:
+    """
+    READ THE Retry-After HEADER FROM AN HTTP ERROR, IF IT HAS ONE.
+
+    WORKS WITH ANY EXCEPTION EXPOSING .response.headers (E.G., httpx.HTTPStatusError).
+
+    :param exc: Exception raised by the provider call.
+    :return: Seconds to wait, or None if the header is missing or invalid.
+    """
+    response = getattr(exc, "response", None)
+    value = getattr(response, "headers", {}).get("Retry-After")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """
+    DEFAULT RETRY PREDICATE: RETRY TRANSPORT ERRORS AND HTTP ERRORS WITH A RETRYABLE STATUS CODE.
+
+    ANY OTHER EXCEPTION (E.G., A TypeError FROM A BUG) IS RAISED IMMEDIATELY.
+
+    :param exc: Exception raised by the provider call.
+    :return: True if the call should be retried.
+    """
+    if isinstance(exc, TRANSPORT_ERRORS):
+        return True
+    response = getattr(exc, "response", None)
+    return getattr(response, "status_code", None) in RETRYABLE_STATUS_CODES
+
+
+def retry(
+    retry_on: tuple[type[BaseException], ...] = (Exception,),
+    attempts: int = 5,
+    initial: float = 0.2,
+    max_wait: float = 5.0,
+    jitter: float = 1.0,
+    max_retry_after: float = 60.0,
+    should_retry=is_retryable,
+):
+    """
+    DECORATE AN ASYNC FUNCTION TO RETRY IT WITH EXPONENTIAL BACKOFF AND JITTER.
+
+    WAITS min(max_wait, initial * 2 ** n + uniform(0, jitter)) BEFORE RETRY n + 1,
+    OR THE SERVER'S Retry-After (AT MOST max_retry_after) WHEN IT SENDS ONE. THE LAST ERROR IS RE-RAISED.
+
+    :param retry_on: Exception types that may be retried.
+    :param attempts: Total number of attempts, including the first.
+    :param initial: Base wait in seconds.
+    :param max_wait: Upper bound on the computed backoff in seconds.
+    :param jitter: Upper bound of random seconds added to each backoff.
+    :param max_retry_after: Upper bound on a server-requested Retry-After wait in seconds.
+    :param should_retry: Predicate deciding whether a caught exception is retried.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            for attempt in range(attempts):
+                try:
+                    return await func(*args, **kwargs)
+                except retry_on as exc:
+                    if attempt == attempts - 1 or not should_retry(exc):
+                        raise
+                    wait = retry_after_seconds(exc)
+                    if wait is not None:
+                        wait = min(wait, max_retry_after)
+                    else:
+                        wait = min(max_wait, initial * 2 ** attempt + random.uniform(0, jitter))
+                    await asyncio.sleep(wait)
+        return wrapper
+    return decorator
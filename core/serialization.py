@@ -0,0 +1,36 @@
+"""
+JSON ENCODING HELPERS FOR PROVIDER REQUEST BODIES.
+
+USES orjson WHEN IT IS INSTALLED AND FALLS BACK TO THE STANDARD LIBRARY OTHERWISE.
+BOTH PATHS PRODUCE COMPACT UTF-8 BYTES, SO PROVIDERS CAN PASS THE RESULT STRAIGHT
+TO AN HTTP CLIENT (E.G., httpx's content=) WITHOUT RE-ENCODING IT.
+"""
+try:
+    import orjson
+except ImportError:
+    orjson = None
+    import json
+
+
+def dumps(obj) -> bytes:
+    """
+    SERIALIZE obj TO COMPACT UTF-8 JSON BYTES.
+
+    :param obj: JSON-compatible object (dicts, lists, strings, numbers, bools, None).
+    :return: Encoded JSON bytes.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def loads(data: bytes | str):
+    """
+    PARSE JSON FROM BYTES OR STR.
+
+    :param data: Encoded JSON (E.G., A RESPONSE BODY).
+    :return: Decoded Python object.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -0,0 +1,53 @@
+from collections.abc import Sequence
+import pytest
+from core.chainview import ChainView
+from core.message import Message
+
+
+def make_view():
+    a, b, c = Message("user", "a"), Message("assistant", "b"), Message("user", "c")
+    return ChainView([a, b], (c,)), [a, b, c]
+
+
+def test_iter_and_len():
+    view, messages = make_view()
+    assert list(view) == messages
+    assert len(view) == 3
+
+
+def test_indexing():
+    view, messages = make_view()
+    assert view[0] is messages[0]
+    assert view[2] is messages[2]
+    assert view[-1] is messages[2]
+    assert view[-3] is messages[0]
+
+
+def test_index_out_of_range():
+    view, _ = make_view()
+    with pytest.raises(IndexError):
+        view[3]
+    with pytest.raises(IndexError):
+        view[-4]
+
+
+def test_view_reflects_underlying_parts():
+    context = [Message("user", "a")]
+    view = ChainView(context, ())
+    context.append(Message("user", "b"))
+    assert len(view) == 2
+
+
+def test_slicing():
+    view, messages = make_view()
+    assert view[1:] == messages[1:]
+    assert view[::-1] == messages[::-1]
+    assert view[-2:] == messages[-2:]
+
+
+def test_is_a_sequence():
+    view, messages = make_view()
+    assert isinstance(view, Sequence)
+    assert messages[1] in view
+    assert view.index(messages[2]) == 2
+    assert list(reversed(view)) == messages[::-1]
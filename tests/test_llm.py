@@ -0,0 +1,258 @@
+import pytest
+from core.chainview import ChainView
+from core.config import Config
+from core.llm import LLM
+from core.message import Message
+
+
+class EchoLLM(LLM):
+    async def generate(self, messages):
+        return messages[-1].content
+
+
+class FieldsLLM(EchoLLM):
+    def request_fields(self):
+        return {"model": self.config.get("model"), "max_tokens": 16}
+
+
+def fill(llm, *contents):
+    for content in contents:
+        llm.append_message(Message("user", content))
+
+
+def contents(llm):
+    return [message.content for message in llm.context]
+
+
+def test_unbounded_by_default():
+    llm = EchoLLM(Config())
+    fill(llm, *"abcdef")
+    assert contents(llm) == list("abcdef")
+
+
+def test_max_context_messages_evicts_oldest():
+    llm = EchoLLM(Config(max_context_messages=2))
+    fill(llm, "a", "b", "c")
+    assert contents(llm) == ["b", "c"]
+
+
+def test_max_context_bytes_evicts_oldest():
+    llm = EchoLLM(Config(max_context_bytes=4))
+    fill(llm, "aa", "bb", "cc")
+    assert contents(llm) == ["bb", "cc"]
+
+
+def test_system_messages_are_never_evicted():
+    llm = EchoLLM(Config(max_context_messages=2))
+    llm.append_message(Message("system", "rules"))
+    fill(llm, "a", "b")
+    assert contents(llm) == ["rules", "b"]
+
+
+def test_pinned_messages_are_never_evicted():
+    llm = EchoLLM(Config(max_context_messages=2))
+    fill(llm, "a")
+    llm.pin(0)
+    fill(llm, "b", "c")
+    assert contents(llm) == ["a", "c"]
+
+
+def test_budget_stops_when_only_pinned_messages_remain():
+    llm = EchoLLM(Config(max_context_messages=1))
+    llm.append_message(Message("system", "one"))
+    llm.append_message(Message("system", "two"))
+    assert contents(llm) == ["one", "two"]
+
+
+def test_reset_context():
+    llm = EchoLLM(Config(max_context_bytes=10))
+    fill(llm, "aaaa", "bbbb")
+    llm.reset_context()
+    assert contents(llm) == []
+    fill(llm, "cccc", "dddd")
+    assert contents(llm) == ["cccc", "dddd"]
+
+
+def test_cold_messages_are_compressed():
+    llm = EchoLLM(Config(compress_after_messages=2, compress_min_bytes=0))
+    text = "lorem ipsum " * 50
+    fill(llm, text + "1", text + "2", text + "3")
+    assert [message.is_compressed for message in llm.context] == [True, False, False]
+    assert contents(llm) == [text + "1", text + "2", text + "3"]
+
+
+def test_encode_request_without_fields():
+    llm = EchoLLM(Config())
+    fill(llm, "a")
+    assert llm.encode_request(llm.context) == b'{"messages":[{"role":"user","content":"a"}]}'
+
+
+def test_encode_request_with_fields_and_prompt_view():
+    llm = FieldsLLM(Config(model="m"))
+    fill(llm, "a", "b")
+    prompt = Message("user", "c")
+    body = llm.encode_request(ChainView(llm.context, (prompt,)))
+    expected = (
+        b'{"model":"m","max_tokens":16,"messages":['
+        + b",".join(message.json_bytes() for message in [*llm.context, prompt])
+        + b"]}"
+    )
+    assert body == expected
+    assert llm.encode_request([prompt]) == b'{"model":"m","max_tokens":16,"messages":[' + prompt.json_bytes() + b"]}"
+
+
+def test_encode_request_follows_config_changes():
+    llm = FieldsLLM(Config(model="m"))
+    llm.encode_request(llm.context)
+    llm.update_config(model="n")
+    assert llm.encode_request(llm.context).startswith(b'{"model":"n"')
+
+
+def test_encoded_context_survives_eviction():
+    llm = EchoLLM(Config(max_context_messages=2))
+    fill(llm, "a", "b")
+    llm.encode_request(llm.context)
+    fill(llm, "c", "d")
+    assert llm.encode_request(llm.context) == b'{"messages":' + llm.encode_messages(llm.context) + b"}"
+
+
+def test_replacing_config_is_noticed():
+    llm = EchoLLM(Config())
+    fill(llm, "a")
+    llm.config = Config(max_context_messages=1)
+    fill(llm, "b", "c")
+    assert contents(llm) == ["c"]
+
+
+def test_replacing_config_refreshes_request_prefix():
+    llm = FieldsLLM(Config(model="m"))
+    llm.encode_request(llm.context)
+    llm.config = Config(model="n")
+    assert llm.encode_request(llm.context).startswith(b'{"model":"n"')
+
+
+def test_context_within_budget_does_not_evict():
+    llm = EchoLLM(Config(max_context_bytes=4))
+    fill(llm, "aa", "bb")
+    assert [message.content for message in llm.context_within_budget(2)] == ["bb"]
+    assert llm.context_within_budget() is llm.context
+    assert contents(llm) == ["aa", "bb"]
+
+
+def test_compression_cursor_follows_eviction():
+    llm = EchoLLM(Config(compress_after_messages=1, compress_min_bytes=0, max_context_messages=3))
+    text = "lorem ipsum " * 50
+    llm.append_message(Message("system", text + "rules"))
+    fill(llm, text + "1", text + "2", text + "3", text + "4")
+    assert contents(llm) == [text + "rules", text + "3", text + "4"]
+    assert [message.is_compressed for message in llm.context] == [True, True, False]
+    llm.reset_context()
+    fill(llm, text + "5", text + "6")
+    assert [message.is_compressed for message in llm.context] == [True, False]
+
+
+def test_compression_reaches_shared_messages():
+    a = EchoLLM(Config(compress_after_messages=1, compress_min_bytes=0))
+    b = EchoLLM(Config())
+    shared = Message.get("system", "lorem ipsum " * 50)
+    a.append_message(shared)
+    b.append_message(shared)
+    fill(a, "x")
+    assert b.context[0].is_compressed
+    assert b.context[0].content == "lorem ipsum " * 50
+
+
+def test_context_view_is_read_only():
+    llm = EchoLLM(Config())
+    fill(llm, "a", "b")
+    with pytest.raises(AttributeError):
+        llm.context.popleft()
+    with pytest.raises(AttributeError):
+        llm.context.parts
+    assert contents(llm) == ["a", "b"]
+    assert llm.context[1:] == [llm.context[1]]
+
+
+def test_assigning_context_replaces_history_within_budget():
+    llm = EchoLLM(Config(max_context_messages=2))
+    fill(llm, "a", "b")
+    llm.pin(0)
+    llm.encode_request(llm.context)
+    llm.context = [Message("user", "x"), Message("user", "y"), Message("user", "z")]
+    assert contents(llm) == ["y", "z"]
+    llm.context = llm.context[:1]
+    assert contents(llm) == ["y"]
+    assert llm.encode_request(llm.context) == llm.encode_request(list(llm.context))
+
+
+def test_pop_messages_keeps_bookkeeping_in_step():
+    llm = EchoLLM(Config(max_context_bytes=6, compress_after_messages=1, compress_min_bytes=0))
+    fill(llm, "aa", "bb", "cc")
+    assert [message.content for message in llm.pop_messages(2)] == ["bb", "cc"]
+    assert contents(llm) == ["aa"]
+    assert llm.pop_messages(5)[0].content == "aa"
+    assert llm.pop_messages() == []
+    fill(llm, "dd", "ee", "ff")
+    assert contents(llm) == ["dd", "ee", "ff"]
+
+
+def test_pop_messages_drops_stale_encoded_context():
+    llm = EchoLLM(Config())
+    fill(llm, "a", "b")
+    llm.encode_request(llm.context)
+    llm.pop_messages()
+    fill(llm, "c")
+    assert llm.encode_request(llm.context) == llm.encode_request(list(llm.context))
+
+
+def test_encoded_context_matches_after_same_length_change():
+    llm = EchoLLM(Config(max_context_messages=2))
+    fill(llm, "a", "b")
+    llm.encode_request(llm.context)
+    fill(llm, "c")
+    assert contents(llm) == ["b", "c"]
+    assert llm.encode_request(llm.context) == b'{"messages":' + llm.encode_messages(llm.context) + b"}"
+
+
+def test_appending_does_not_encode_until_a_request_is_built():
+    llm = EchoLLM(Config())
+    fill(llm, "a", "b")
+    assert llm._encoded_tail is None
+    assert all(message._json_bytes is None for message in llm.context)
+    llm.encode_request(llm.context)
+    fill(llm, "c")
+    assert bytes(llm._encoded_tail) == llm.encode_messages(llm.context)[1:-1]
+
+
+def test_encoded_buffer_is_not_kept_while_compressing():
+    llm = EchoLLM(Config(compress_after_messages=1, compress_min_bytes=0))
+    text = "lorem ipsum " * 50
+    fill(llm, text + "1", text + "2")
+    body = llm.encode_request(llm.context)
+    fill(llm, text + "3")
+    assert llm._encoded_tail is None
+    assert llm.encode_request(llm.context) == b'{"messages":' + llm.encode_messages(llm.context) + b"}"
+    assert body.count(b"lorem") == 100
+
+
+def test_enabling_compression_drops_the_encoded_buffer():
+    llm = EchoLLM(Config())
+    fill(llm, "a")
+    llm.encode_request(llm.context)
+    llm.update_config(compress_after_messages=1)
+    fill(llm, "b")
+    assert llm._encoded_tail is None
+
+
+def test_config_subclass_without_super_init():
+    class DictConfig(Config):
+        def __init__(self, **params):
+            self.params = dict(params)
+
+    llm = EchoLLM(DictConfig(max_context_messages=1))
+    fill(llm, "a", "b")
+    assert contents(llm) == ["b"]
+    llm.update_config(max_context_messages=2)
+    assert llm.config.version == 1
+    fill(llm, "c")
+    assert contents(llm) == ["b", "c"]
@@ -0,0 +1,259 @@
+import asyncio
+import pytest
+from core.config import Config
+from core.llm import LLM
+from core.llmmanager import LLMManager
+
+
+class EchoLLM(LLM):
+    async def generate(self, messages):
+        return f"echo:{messages[-1].content}" if len(messages) else "empty"
+
+
+class FailingLLM(LLM):
+    async def generate(self, messages):
+        raise RuntimeError("boom")
+
+
+class SleepyLLM(LLM):
+    async def generate(self, messages):
+        await asyncio.sleep(self.config.get("delay", 0))
+        return f"{self.config.get('delay', 0)}"
+
+
+class StreamingLLM(LLM):
+    async def generate(self, messages):
+        return "".join([chunk async for chunk in self.generate_stream(messages)])
+
+    async def generate_stream(self, messages):
+        for chunk in ("he", "llo"):
+            yield chunk
+
+
+def make_manager(*model_classes):
+    manager = LLMManager()
+    for model_class in model_classes:
+        manager.register_model_type(model_class)
+    return manager
+
+
+def contents(manager, instance_id):
+    return [message.content for message in manager.model_instances[instance_id].context]
+
+
+def test_register_rejects_non_llm_and_duplicates():
+    manager = make_manager(EchoLLM)
+    with pytest.raises(ValueError):
+        manager.register_model_type(object)
+    with pytest.raises(ValueError):
+        manager.register_model_type(EchoLLM)
+
+
+def test_instantiate_requires_registration_and_unique_ids():
+    manager = make_manager(EchoLLM)
+    with pytest.raises(ValueError):
+        manager.instantiate_model("a", FailingLLM, Config())
+    manager.instantiate_model("a", EchoLLM, Config())
+    with pytest.raises(ValueError):
+        manager.instantiate_model("a", EchoLLM, Config())
+
+
+def test_system_prompts_are_shared():
+    manager = make_manager(EchoLLM)
+    manager.instantiate_model("a", EchoLLM, Config(), system_prompt="Be brief.")
+    manager.instantiate_model("b", EchoLLM, Config(), system_prompt="Be brief.")
+    a = manager.model_instances["a"].context[0]
+    assert manager.model_instances["b"].context[0] is a
+    assert a.role == "system"
+
+
+def test_turns_are_not_shared_between_instances():
+    manager = make_manager(EchoLLM)
+    manager.instantiate_model("a", EchoLLM, Config())
+    manager.instantiate_model("b", EchoLLM, Config())
+    asyncio.run(manager.use_multiple_models(["a", "b"], "hi", save_context=True, append_prompt=True))
+    assert manager.model_instances["a"].context[0] is not manager.model_instances["b"].context[0]
+
+
+def test_use_model_saves_prompt_and_response():
+    manager = make_manager(EchoLLM)
+    manager.instantiate_model("a", EchoLLM, Config())
+    response = asyncio.run(manager.use_model("a", "hi", save_context=True, append_prompt=True))
+    assert response == "echo:hi"
+    assert contents(manager, "a") == ["hi", "echo:hi"]
+
+
+def test_use_model_without_save_leaves_context_untouched():
+    manager = make_manager(EchoLLM)
+    manager.instantiate_model("a", EchoLLM, Config())
+    assert asyncio.run(manager.use_model("a", "hi", append_prompt=True)) == "echo:hi"
+    assert contents(manager, "a") == []
+
+
+def test_use_model_unknown_instance():
+    manager = make_manager(EchoLLM)
+    with pytest.raises(ValueError):
+        asyncio.run(manager.use_model("missing", "hi"))
+
+
+def test_use_model_stream_yields_chunks_and_saves_full_response():
+    manager = make_manager(StreamingLLM)
+    manager.instantiate_model("a", StreamingLLM, Config())
+
+    async def collect():
+        return [chunk async for chunk in manager.use_model_stream("a", "hi", save_context=True, append_prompt=True)]
+
+    assert asyncio.run(collect()) == ["he", "llo"]
+    assert contents(manager, "a") == ["hi", "hello"]
+
+
+def test_default_generate_stream_yields_whole_response():
+    manager = make_manager(EchoLLM)
+    manager.instantiate_model("a", EchoLLM, Config())
+
+    async def collect():
+        return [chunk async for chunk in manager.use_model_stream("a", "hi", append_prompt=True)]
+
+    assert asyncio.run(collect()) == ["echo:hi"]
+
+
+def test_use_multiple_models_collects_responses_and_errors():
+    manager = make_manager(EchoLLM, FailingLLM)
+    manager.instantiate_model("a", EchoLLM, Config())
+    manager.instantiate_model("b", FailingLLM, Config())
+    results = asyncio.run(manager.use_multiple_models(["b", "a", "a"], "hi", append_prompt=True))
+    assert list(results) == ["b", "a"]
+    assert results == {"b": "ERROR: boom", "a": "echo:hi"}
+
+
+def test_use_multiple_models_reports_unknown_instances():
+    manager = make_manager(EchoLLM)
+    results = asyncio.run(manager.use_multiple_models(["missing"], "hi"))
+    assert results["missing"].startswith("ERROR:")
+
+
+def test_use_multiple_models_runs_in_parallel():
+    manager = make_manager(SleepyLLM)
+    for instance_id in "abcd":
+        manager.instantiate_model(instance_id, SleepyLLM, Config(delay=0.2))
+
+    async def timed():
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        await manager.use_multiple_models(list("abcd"), "hi")
+        return loop.time() - start
+
+    assert asyncio.run(timed()) < 0.6
+
+
+def test_streaming_yields_in_completion_order():
+    manager = make_manager(SleepyLLM)
+    manager.instantiate_model("slow", SleepyLLM, Config(delay=0.2))
+    manager.instantiate_model("fast", SleepyLLM, Config(delay=0.01))
+
+    async def collect():
+        return [pair async for pair in manager.use_multiple_models_streaming(["slow", "fast"], "hi")]
+
+    assert asyncio.run(collect()) == [("fast", "0.01"), ("slow", "0.2")]
+
+
+def test_print_conversation_history(capsys):
+    manager = make_manager(EchoLLM)
+    manager.instantiate_model("a", EchoLLM, Config(), system_prompt="rules")
+    manager.print_conversation_history("a")
+    assert capsys.readouterr().out == (
+        "--- CONVERSATION HISTORY FOR 'a' ---\nSYSTEM: rules\n--- END CONVERSATION ---\n"
+    )
+    with pytest.raises(ValueError):
+        manager.print_conversation_history("missing")
+
+
+def test_shutdown_removes_instances_and_closes_classes():
+    closed = []
+
+    class ClosingLLM(EchoLLM):
+        @classmethod
+        async def aclose(cls):
+            closed.append(cls)
+
+    manager = make_manager(ClosingLLM)
+    manager.instantiate_model("a", ClosingLLM, Config())
+    asyncio.run(manager.shutdown())
+    assert manager.get_model_instances() == []
+    assert closed == [ClosingLLM]
+
+
+def test_cancelling_use_multiple_models_cancels_its_requests():
+    manager = make_manager(SleepyLLM)
+    manager.instantiate_model("a", SleepyLLM, Config(delay=0.2))
+
+    async def cancel_midway():
+        task = asyncio.create_task(
+            manager.use_multiple_models(["a"], "hi", save_context=True, append_prompt=True)
+        )
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        await asyncio.sleep(0.3)
+
+    asyncio.run(cancel_midway())
+    assert contents(manager, "a") == []
+
+
+def test_busy_instance_does_not_block_siblings():
+    manager = make_manager(SleepyLLM)
+    manager.instantiate_model("busy", SleepyLLM, Config(delay=0.01))
+    manager.instantiate_model("fast", SleepyLLM, Config(delay=0.01))
+    manager.instantiate_model("slow", SleepyLLM, Config(delay=0.3))
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        busy = manager.model_instances["busy"]
+        await busy.lock.acquire()
+        loop.call_later(0.3, busy.lock.release)
+        start = loop.time()
+        arrivals = {}
+        async for instance_id, _ in manager.use_multiple_models_streaming(["busy", "fast", "slow"], "hi"):
+            arrivals[instance_id] = loop.time() - start
+        return arrivals
+
+    arrivals = asyncio.run(run())
+    assert arrivals["fast"] < 0.15
+    assert arrivals["busy"] >= 0.3
+
+
+def test_one_off_query_keeps_saved_context_within_budget():
+    manager = make_manager(EchoLLM)
+    manager.instantiate_model("a", EchoLLM, Config(max_context_bytes=10))
+    llm = manager.model_instances["a"]
+
+    sent = []
+
+    async def generate(messages):
+        sent.append([message.content for message in messages])
+        return "ok"
+
+    llm.generate = generate
+    asyncio.run(manager.use_model("a", "12345", save_context=True, append_prompt=True))
+    asyncio.run(manager.use_model("a", "abcdefgh", append_prompt=True))
+    assert sent[-1] == ["ok", "abcdefgh"]
+    assert contents(manager, "a") == ["12345", "ok"]
+
+    asyncio.run(manager.use_model("a", "abcdefgh", save_context=True, append_prompt=True))
+    assert contents(manager, "a") == ["abcdefgh", "ok"]
+
+
+def test_dict_response_from_a_single_instance_is_not_a_batch():
+    class DictLLM(LLM):
+        async def generate(self, messages):
+            return {"text": "hi"}
+
+    manager = make_manager(DictLLM)
+    manager.instantiate_model("a", DictLLM, Config())
+    assert asyncio.run(manager.use_multiple_models(["a"], "hi")) == {"a": {"text": "hi"}}
+
+    async def collect():
+        return [pair async for pair in manager.use_multiple_models_streaming(["a"], "hi")]
+
+    assert asyncio.run(collect()) == [("a", {"text": "hi"})]
@@ -0,0 +1,71 @@
+import copy
+import pickle
+import pytest
+from core.message import Message, ROLE_IDS, role_id
+
+
+def test_known_roles_have_fixed_ids():
+    assert Message("user", "hi").role_id == ROLE_IDS["user"]
+    assert Message("system", "hi").role == "system"
+
+
+def test_unknown_role_is_registered_once():
+    rid = role_id("tool")
+    assert role_id("tool") == rid
+    assert Message("tool", "x").role == "tool"
+
+
+def test_message_has_no_instance_dict():
+    assert not hasattr(Message("user", "hi"), "__dict__")
+
+
+def test_message_is_immutable():
+    message = Message("user", "hi")
+    with pytest.raises(AttributeError):
+        message.role_id = 1
+    with pytest.raises(AttributeError):
+        del message.role_id
+
+
+def test_json_bytes():
+    message = Message("user", "héllo")
+    assert message.json_bytes() == '{"role":"user","content":"héllo"}'.encode("utf-8")
+    assert message.json_bytes() is message.json_bytes()
+
+
+def test_get_shares_identical_messages():
+    first = Message.get("system", "You are concise.")
+    assert Message.get("system", "You are concise.") is first
+    assert Message.get("user", "You are concise.") is not first
+
+
+def test_compress_round_trip():
+    content = "lorem ipsum " * 100
+    message = Message("user", content)
+    message.compress()
+    assert message.is_compressed
+    assert message.content == content
+    assert message.json_bytes() == Message("user", content).json_bytes()
+
+
+def test_compress_skips_small_or_incompressible_content():
+    small = Message("user", "short")
+    small.compress(min_bytes=256)
+    assert not small.is_compressed
+    noise = Message("user", "a")
+    noise.compress()
+    assert not noise.is_compressed
+
+
+def test_copies_return_the_same_immutable_message():
+    message = Message("user", "hi")
+    assert copy.copy(message) is message
+    assert copy.deepcopy([message])[0] is message
+
+
+def test_pickle_round_trip():
+    message = Message("assistant", "lorem ipsum " * 100)
+    message.compress()
+    restored = pickle.loads(pickle.dumps(message))
+    assert restored.role == "assistant"
+    assert restored.content == message.content
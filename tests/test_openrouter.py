@@ -0,0 +1,188 @@
+import asyncio
+import json
+import pytest
+from core.config import Config
+from core.llmmanager import LLMManager
+
+httpx = pytest.importorskip("httpx")
+from core.openrouter import OpenRouterLLM  # noqa: E402
+
+
+@pytest.fixture
+def use_transport(monkeypatch):
+    clients = []
+
+    def install(handler):
+        def new_client():
+            clients.append(httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+            return clients[-1]
+
+        monkeypatch.setattr(OpenRouterLLM, "_new_client", staticmethod(new_client))
+        return clients
+
+    monkeypatch.setattr(OpenRouterLLM, "_client", None)
+    monkeypatch.setattr(OpenRouterLLM, "_client_loop", None)
+    return install
+
+
+def reply_handler(seen):
+    def handler(request):
+        seen.append(request)
+        body = json.loads(request.content)
+        reply = f"reply to {body['messages'][-1]['content']}"
+        return httpx.Response(200, json={"choices": [{"message": {"role": "assistant", "content": reply}}]})
+
+    return handler
+
+
+@pytest.fixture
+def requests_seen(use_transport):
+    seen = []
+    use_transport(reply_handler(seen))
+    return seen
+
+
+def make_manager(**params):
+    manager = LLMManager()
+    manager.register_model_type(OpenRouterLLM)
+    manager.instantiate_model(
+        "a", OpenRouterLLM, Config(api_key="sk-test", model="m", **params), system_prompt="Be brief."
+    )
+    return manager
+
+
+def test_generate_sends_encoded_request(requests_seen):
+    manager = make_manager(max_tokens=32)
+
+    async def converse():
+        first = await manager.use_model("a", "hi", save_context=True, append_prompt=True)
+        second = await manager.use_model("a", "again", save_context=True, append_prompt=True)
+        return first, second
+
+    assert asyncio.run(converse()) == ("reply to hi", "reply to again")
+    request = requests_seen[-1]
+    assert request.url == "https://openrouter.ai/api/v1/chat/completions"
+    assert request.headers["Authorization"] == "Bearer sk-test"
+    assert json.loads(request.content) == {
+        "model": "m",
+        "max_tokens": 32,
+        "messages": [
+            {"role": "system", "content": "Be brief."},
+            {"role": "user", "content": "hi"},
+            {"role": "assistant", "content": "reply to hi"},
+            {"role": "user", "content": "again"},
+        ],
+    }
+
+
+def test_error_status_is_raised(use_transport):
+    use_transport(lambda request: httpx.Response(401))
+    manager = make_manager()
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(manager.use_model("a", "hi", append_prompt=True))
+
+
+def test_client_is_shared_within_a_loop_and_recreated_for_a_new_one(use_transport):
+    clients = use_transport(reply_handler([]))
+    manager = make_manager()
+
+    async def twice():
+        await manager.use_model("a", "one", append_prompt=True)
+        await manager.use_model("a", "two", append_prompt=True)
+
+    asyncio.run(twice())
+    assert len(clients) == 1
+    assert asyncio.run(manager.use_model("a", "three", append_prompt=True)) == "reply to three"
+    assert len(clients) == 2
+
+
+def test_default_client_settings(monkeypatch):
+    monkeypatch.setattr(OpenRouterLLM, "_client", None)
+    monkeypatch.setattr(OpenRouterLLM, "_client_loop", None)
+
+    async def make():
+        client = OpenRouterLLM.client()
+        await OpenRouterLLM.aclose()
+        return client
+
+    client = asyncio.run(make())
+    pool = client._transport._pool
+    assert pool._max_keepalive_connections == 32
+    assert pool._max_connections == 64
+
+
+def test_shutdown_closes_shared_client(requests_seen):
+    manager = make_manager()
+
+    async def run():
+        client = OpenRouterLLM.client()
+        assert OpenRouterLLM.client() is client
+        await manager.shutdown()
+        return client
+
+    assert asyncio.run(run()).is_closed
+    assert OpenRouterLLM._client is None
+
+
+def test_transient_errors_are_retried(monkeypatch, use_transport):
+    from core import retry as retry_module
+
+    async def no_sleep(seconds):
+        pass
+
+    monkeypatch.setattr(retry_module.asyncio, "sleep", no_sleep)
+    statuses = [503, 429]
+
+    def handler(request):
+        if statuses:
+            return httpx.Response(statuses.pop(0))
+        return httpx.Response(200, json={"choices": [{"message": {"content": "ok"}}]})
+
+    use_transport(handler)
+    manager = make_manager()
+    assert asyncio.run(manager.use_model("a", "hi", append_prompt=True)) == "ok"
+
+
+def test_endpoint_is_cached_until_config_changes(requests_seen):
+    manager = make_manager()
+    llm = manager.model_instances["a"]
+    url, headers = llm.endpoint()
+    assert llm.endpoint()[1] is headers
+    with pytest.raises(TypeError):
+        headers["Authorization"] = "Bearer other"
+
+    llm.config.set("api_key", "sk-new")
+    llm.config.set("base_url", "https://example.test/v1")
+    asyncio.run(manager.use_model("a", "hi", append_prompt=True))
+    assert requests_seen[-1].url == "https://example.test/v1/chat/completions"
+    assert requests_seen[-1].headers["Authorization"] == "Bearer sk-new"
+
+
+def test_generate_stream_yields_sse_deltas(use_transport):
+    seen = []
+
+    def handler(request):
+        seen.append(json.loads(request.content))
+        events = [
+            ": OPENROUTER PROCESSING",
+            'data: {"choices":[{"delta":{"role":"assistant","content":""}}]}',
+            'data: {"choices":[{"delta":{"content":"hel"}}]}',
+            'data: {"choices":[{"delta":{"content":"lo"}}]}',
+            'data: {"choices":[],"usage":{"total_tokens":3}}',
+            "data: [DONE]",
+            'data: {"choices":[{"delta":{"content":"ignored"}}]}',
+        ]
+        return httpx.Response(200, text="\n\n".join(events) + "\n\n", headers={"Content-Type": "text/event-stream"})
+
+    use_transport(handler)
+    manager = make_manager(max_tokens=8)
+
+    async def collect():
+        stream = manager.use_model_stream("a", "hi", save_context=True, append_prompt=True)
+        return [chunk async for chunk in stream]
+
+    assert asyncio.run(collect()) == ["hel", "lo"]
+    assert seen[0]["stream"] is True
+    assert seen[0]["model"] == "m" and seen[0]["max_tokens"] == 8
+    assert seen[0]["messages"][-1] == {"role": "user", "content": "hi"}
+    assert [message.content for message in manager.model_instances["a"].context][-1] == "hello"
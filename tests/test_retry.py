@@ -0,0 +1,100 @@
+import asyncio
+import pytest
+from core import retry as retry_module
+from core.retry import retry, retry_after_seconds
+
+
+class Response:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+class StatusError(Exception):
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"HTTP {status_code}")
+        self.response = Response(status_code, headers)
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    waits = []
+
+    async def fake_sleep(seconds):
+        waits.append(seconds)
+
+    monkeypatch.setattr(retry_module.asyncio, "sleep", fake_sleep)
+    return waits
+
+
+def flaky(errors, result="ok"):
+    calls = []
+
+    async def func():
+        calls.append(None)
+        if len(calls) <= len(errors):
+            raise errors[len(calls) - 1]
+        return result
+
+    return func, calls
+
+
+def test_retries_retryable_status_then_succeeds(sleeps):
+    func, calls = flaky([StatusError(503), StatusError(429)])
+    assert asyncio.run(retry(jitter=0)(func)()) == "ok"
+    assert len(calls) == 3
+    assert sleeps == [0.2, 0.4]
+
+
+def test_non_retryable_status_is_raised_immediately(sleeps):
+    func, calls = flaky([StatusError(400)])
+    with pytest.raises(StatusError):
+        asyncio.run(retry()(func)())
+    assert len(calls) == 1
+    assert sleeps == []
+
+
+def test_gives_up_after_attempts(sleeps):
+    func, calls = flaky([StatusError(500)] * 3)
+    with pytest.raises(StatusError):
+        asyncio.run(retry(attempts=3, jitter=0)(func)())
+    assert len(calls) == 3
+
+
+def test_backoff_is_capped(sleeps):
+    func, _ = flaky([StatusError(503)] * 4)
+    asyncio.run(retry(initial=1.0, max_wait=3.0, jitter=0)(func)())
+    assert sleeps == [1.0, 2.0, 3.0, 3.0]
+
+
+def test_retry_after_header_overrides_backoff(sleeps):
+    func, _ = flaky([StatusError(429, {"Retry-After": "1.5"})])
+    asyncio.run(retry()(func)())
+    assert sleeps == [1.5]
+
+
+def test_retry_after_seconds_parsing():
+    assert retry_after_seconds(StatusError(429, {"Retry-After": "2"})) == 2.0
+    assert retry_after_seconds(StatusError(429, {"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"})) == 0.0
+    assert retry_after_seconds(StatusError(429, {"Retry-After": "soon"})) is None
+    assert retry_after_seconds(StatusError(429)) is None
+    assert retry_after_seconds(ValueError()) is None
+
+
+def test_errors_without_retryable_status_are_not_retried(sleeps):
+    func, calls = flaky([TypeError("bug")])
+    with pytest.raises(TypeError):
+        asyncio.run(retry()(func)())
+    assert len(calls) == 1
+
+
+def test_transport_errors_are_retried(sleeps):
+    func, calls = flaky([ConnectionResetError(), TimeoutError()])
+    assert asyncio.run(retry(jitter=0)(func)()) == "ok"
+    assert len(calls) == 3
+
+
+def test_retry_after_is_capped(sleeps):
+    func, _ = flaky([StatusError(429, {"Retry-After": "3600"})] * 2)
+    asyncio.run(retry(max_retry_after=30.0)(func)())
+    assert sleeps == [30.0, 30.0]